@@ -1,10 +1,17 @@
 from conan import ConanFile
-from conan.tools.cmake import cmake_layout
-from conan.tools.files import copy, load
 import os
 
+
+# Trees shipped in the package, headers plus .c files for the OBJECT library
+_PACKAGE_SUBDIRS = ("include", "CMSIS_RTOS", "CMSIS_RTOS_V2",
+                    "portable/GCC", "source", "portable/MemMang")
+_PACKAGE_EXTS = (".h", ".c")
+
+
 class FreeRTOSConan(ConanFile):
     name            = "freertos"
+    python_requires = "base_conan/1.0.0"
+    python_requires_extend = "base_conan.BaseRecipe"
 
     license         = "MIT"
     url             = "https://github.com/FreeRTOS/FreeRTOS-Kernel"
@@ -14,35 +21,54 @@ class FreeRTOSConan(ConanFile):
     settings        = "os", "arch", "compiler", "build_type"
     package_type    = "header-library"
 
-    exports_sources = "*"
+    # Only the trees package() ships, not the other compiler ports
+    exports_sources = ("include/**", "source/**", "portable/GCC/**",
+                       "portable/MemMang/**", "CMSIS_RTOS/**",
+                       "CMSIS_RTOS_V2/**", "version.txt")
+    no_copy_source  = True
 
-    def set_version(self):
-        self.version = load(
-            self, os.path.join(self.recipe_folder, "version.txt")
-        ).strip()
-        
     def layout(self):
+        # conan.tools.cmake is only needed here, keep it off the recipe load path
+        from conan.tools.cmake import cmake_layout
         cmake_layout(self)
 
     def package(self):
-     # Kernel headers and source files
-     src, dst = self.source_folder, self.package_folder
-
-     # 1) Public headers
-     for sub in ("include", "CMSIS_RTOS", "CMSIS_RTOS_V2", "portable/GCC"):
-          copy(self, "*.h",
-               src=os.path.join(src, sub),
-               dst=os.path.join(dst, sub),
-               keep_path=True)
-
-     # 2) Ship .c files so the consumer can build an OBJECT library
-     for sub in ("source", "portable/GCC", "portable/MemMang",
-               "CMSIS_RTOS", "CMSIS_RTOS_V2"):
-          copy(self, "*.c",
-               src=os.path.join(src, sub),
-               dst=os.path.join(dst, sub),
-               keep_path=True)
-     
+        # Ship headers and .c files in one pass so the consumer can build
+        # an OBJECT library from the kernel sources.
+        self._copy_tree_filtered(self.source_folder, self.package_folder,
+                                 allowed_exts=_PACKAGE_EXTS,
+                                 allowed_subs=_PACKAGE_SUBDIRS)
+
+    def _copy_tree_filtered(self, src_root, dst_root, allowed_exts, allowed_subs):
+        """Copy files under ``allowed_subs`` ending in one of the
+        ``allowed_exts`` tuple, walking ``src_root`` only once."""
+        subs = {os.path.normpath(sub) for sub in allowed_subs}
+        # Every parent of a shipped subdirectory has to be walked to reach it
+        parents = {os.path.join(*parts[:i])
+                   for parts in (sub.split(os.sep) for sub in subs)
+                   for i in range(1, len(parts))}
+        sub_prefixes = tuple(sub + os.sep for sub in subs)
+
+        src_len = len(os.path.join(src_root, ""))
+        to_copy = []
+        for root, dirs, files in os.walk(src_root, followlinks=False):
+            rel_root = root[src_len:]
+            inside = rel_root in subs or rel_root.startswith(sub_prefixes)
+            if not inside:
+                dirs[:] = [d for d in dirs
+                           if os.path.join(rel_root, d) in subs or
+                           os.path.join(rel_root, d) in parents]
+                continue
+            dst_dir = os.path.join(dst_root, rel_root)
+            to_copy.extend((os.path.join(root, name), os.path.join(dst_dir, name))
+                           for name in files
+                           if name.endswith(allowed_exts))
+
+        self._make_dirs(to_copy)
+        link = self._source_in_cache
+        for src, dst in to_copy:
+            self._copy_if_different(src, dst, link=link)
+
     def package_info(self):
         self.cpp_info.libdirs = []            
         self.cpp_info.bindirs = []
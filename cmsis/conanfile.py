@@ -1,6 +1,7 @@
 import os
+from fnmatch import fnmatch
 from conan import ConanFile
-from conan.tools.files import copy, load
+
 
 class CmsisHeaderOnly(ConanFile):
     name = "cmsis"
@@ -10,19 +11,24 @@ class CmsisHeaderOnly(ConanFile):
     author = "Adam Paleczny"
     exports_sources = "Include/*"
     no_copy_source = True
-
-    def set_version(self):
-        self.version = load(
-            self, os.path.join(self.recipe_folder, "version.txt")
-        ).strip()
+    python_requires = "base_conan/1.0.0"
+    python_requires_extend = "base_conan.BaseRecipe"
 
     def package(self):
-        copy(self, pattern="*.h",
-             dst=os.path.join(self.package_folder, "include"),
-             src=os.path.join(self.source_folder, "Include"),
-             keep_path=True)
+        src_root = os.path.join(self.source_folder, "Include")
+        dst_root = os.path.join(self.package_folder, "include")
+        files = []
+        for root, _, names in os.walk(src_root):
+            dst_dir = os.path.join(dst_root, os.path.relpath(root, src_root))
+            files.extend((os.path.join(root, name), os.path.join(dst_dir, name))
+                         for name in names if fnmatch(name, "*.h"))
+
+        self._make_dirs(files)
+        link = self._source_in_cache
+        for src, dst in files:
+            self._copy_if_different(src, dst, link=link)
 
     def package_info(self):
         self.cpp_info.includedirs = ["include"]
         self.cpp_info.set_property("cmake_target_name", "cmsis")
-        self.cpp_info.set_property("cmake_target_type", "interface")
\ No newline at end of file
+        self.cpp_info.set_property("cmake_target_type", "interface")
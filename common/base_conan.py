@@ -0,0 +1,129 @@
+import errno
+import functools
+import hashlib
+import os
+import pathlib
+import platform
+import shutil
+import subprocess
+from conan import ConanFile
+from conan.errors import ConanException
+from conan.tools.files import copy
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_version(path):
+    return pathlib.Path(path).read_text().strip()
+
+
+def _same_digest(a, b):
+    digests = []
+    for path in (a, b):
+        h = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        digests.append(h.digest())
+    return digests[0] == digests[1]
+
+
+def _link_or_copy(src, dst):
+    """Hard link ``src`` as ``dst``, copying when no link can be made
+    (different filesystem, no hard link support, ...)."""
+    try:
+        os.link(src, dst)
+    except OSError as e:
+        if e.errno not in (errno.EXDEV, errno.EPERM, errno.EACCES, errno.EMLINK,
+                           errno.EINVAL, errno.ENOTSUP, errno.EOPNOTSUPP):
+            raise
+        shutil.copy2(src, dst)
+
+
+def _copy_if_different(src, dst, link=False):
+    """Copy ``src`` to ``dst`` unless ``dst`` already holds the same file.
+
+    A destination with the same size and a newer or equal mtime is taken as
+    up to date; an older one of the same size is only rewritten when its
+    content hash differs. With ``link`` the file is hard linked instead,
+    which is only safe when ``src`` lives in the Conan cache.
+    """
+    try:
+        dst_st = os.stat(dst)
+    except FileNotFoundError:
+        pass
+    else:
+        src_st = os.stat(src)
+        if dst_st.st_size == src_st.st_size and (
+                dst_st.st_mtime_ns >= src_st.st_mtime_ns or _same_digest(src, dst)):
+            return
+        # Never write through a stale destination, it may share its inode
+        os.remove(dst)
+    if link:
+        _link_or_copy(src, dst)
+    else:
+        shutil.copy2(src, dst)
+
+
+def _make_dirs(files):
+    """Create the destination directory of every ``(src, dst)`` pair once,
+    so the copies that follow are plain file writes."""
+    for folder in sorted({os.path.dirname(dst) for _, dst in files}):
+        os.makedirs(folder, exist_ok=True)
+
+
+class BaseRecipe:
+    """Shared recipe plumbing, pulled in through ``python_requires_extend``."""
+
+    _cached_version = staticmethod(_cached_version)
+    _link_or_copy = staticmethod(_link_or_copy)
+    _copy_if_different = staticmethod(_copy_if_different)
+    _make_dirs = staticmethod(_make_dirs)
+
+    def set_version(self):
+        self.version = _cached_version(os.path.join(self.recipe_folder, "version.txt"))
+
+    @property
+    def _conan_home(self):
+        return os.getenv("CONAN_HOME", os.path.join(os.path.expanduser("~"), ".conan2"))
+
+    @property
+    def _source_in_cache(self):
+        """Whether ``source_folder`` is inside the Conan cache.
+
+        With ``no_copy_source`` local flows (``export-pkg``, editables) point
+        it at the user's working tree, hard links into the package would then
+        follow every in-place edit, so only cache sources get linked.
+
+        Recipes can't read ``core.*`` confs, so only the storage folder of
+        ``$CONAN_HOME`` (default ``~/.conan2``) is recognised. A custom
+        ``core.cache:storage_path`` or a home set through ``.conanrc`` is
+        treated as outside the cache and files are copied.
+        """
+        storage = os.path.realpath(os.path.join(self._conan_home, "p"))
+        try:
+            return os.path.commonpath([os.path.realpath(self.source_folder), storage]) == storage
+        except ValueError:                   # different drives on Windows
+            return False
+
+    def _fast_copy(self, src, dst):
+        """Copy the whole ``src`` tree into ``dst`` with the host's native
+        bulk copy tool, falling back to Conan's ``copy()``."""
+        os.makedirs(dst, exist_ok=True)
+        if platform.system() == "Windows" and shutil.which("robocopy"):
+            result = subprocess.run(["robocopy", src, dst, "/E", "/MT:32",
+                                     "/NFL", "/NDL", "/NJH", "/NJS", "/NP"], check=False)
+            # robocopy exit codes 0-7 all mean success
+            if result.returncode > 7:
+                raise ConanException(f"robocopy failed copying {src} ({result.returncode})")
+        elif platform.system() != "Windows" and shutil.which("cp"):
+            subprocess.run(["cp", "-a", src + "/.", dst], check=True)
+        else:
+            copy(self, "*", src=src, dst=dst)
+
+
+class BaseConan(ConanFile):
+    name = "base_conan"
+    version = "1.0.0"
+    description = "Common recipe helpers shared by the packages in this repository"
+    author = "Adam Paleczny"
+    package_type = "python-require"
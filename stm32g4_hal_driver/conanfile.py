@@ -1,6 +1,9 @@
 import os
+import pathlib
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatch
 from conan import ConanFile
-from conan.tools.files import copy, load, get
+from conan.tools.files import get
 
 
 class STM32HAL(ConanFile):
@@ -10,37 +13,53 @@ class STM32HAL(ConanFile):
     description = "STM32G4 HAL drivers (e.g., GPIO, UART, etc.)"
     settings = "os", "arch", "compiler", "build_type"
     package_type = "header-library"
-    options = {"shared": [True, False]}
-    default_options = {"shared": False}
-
-    exports_sources = (
-        "Src/**",
-        "Inc/**",
-        "Inc/Legacy/**",
-        "version.txt",
-    )
+    python_requires = "base_conan/1.0.0"
+    python_requires_extend = "base_conan.BaseRecipe"
+    # Sources come from the upstream archive in source(), nothing is exported
+    no_copy_source = True
 
     def requirements(self):
         self.requires("cmsis/1.0.0")
 
-    def set_version(self):
-        self.version = load(
-            self, os.path.join(self.recipe_folder, "version.txt")
-        ).strip()
+    def package_id(self):
+        # Only headers and .c sources are shipped, consumers compile them
+        self.info.clear()
+
+    def source(self):
+        get(self,
+            url="https://github.com/STMicroelectronics/stm32g4xx-hal-driver/archive/refs/tags/v1.2.5.tar.gz",
+            strip_root=True)
 
     def build(self):
         pass
 
     def package(self):
-        get(self,
-            url="https://github.com/STMicroelectronics/stm32g4xx-hal-driver/archive/refs/tags/v1.2.5.tar.gz",
-            strip_root=True)
-        
-        src_root = self.source_folder
+        src_p = pathlib.Path(self.source_folder)
+        dst_p = pathlib.Path(self.package_folder)
+
+        self._fast_copy(str(src_p / "Src"), str(dst_p / "src"))
+        # Inc/Legacy is already covered by Inc since the tree is kept
+        self._copytree([(str(src_p / "Inc"), str(dst_p / "include"), "*.h")])
+
+    def _copytree(self, trees):
+        """Copy every ``(src, dst, pattern)`` tree using a thread pool.
+
+        File copies are I/O bound and release the GIL, so the vendor trees
+        are copied concurrently instead of one file at a time.
+        """
+        files = []
+        for src, dst, pattern in trees:
+            for root, _, names in os.walk(src):
+                dst_dir = os.path.normpath(os.path.join(dst, os.path.relpath(root, src)))
+                files.extend((os.path.join(root, name), os.path.join(dst_dir, name))
+                             for name in names if fnmatch(name, pattern))
+
+        self._make_dirs(files)
+        link = self._source_in_cache
 
-        copy(self, "*", src=os.path.join(src_root, "Src"), dst=os.path.join(self.package_folder, "src"), keep_path=True)
-        copy(self, "*.h", src=os.path.join(src_root, "Inc"), dst=os.path.join(self.package_folder, "include"), keep_path=True)
-        copy(self, "*.h", src=os.path.join(src_root, "Inc", "Legacy"), dst=os.path.join(self.package_folder, "include", "Legacy"), keep_path=True)
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as pool:
+            for future in [pool.submit(self._copy_if_different, src, dst, link) for src, dst in files]:
+                future.result()
 
     def package_info(self):
         self.cpp_info.includedirs = ["include", "include/Legacy"]
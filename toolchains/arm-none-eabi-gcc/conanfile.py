@@ -1,7 +1,142 @@
 # toolchains/arm-none-eabi-gcc/conanfile.py
+from concurrent.futures import ThreadPoolExecutor
 from conan import ConanFile
-from conan.tools.files import get, copy, load
+from conan.errors import ConanException
+from conan.tools.files import check_sha256, download, rmdir
+import errno
+import lzma
 import os
+import re
+import shutil
+import subprocess
+import tarfile
+import tempfile
+
+try:
+    import fcntl
+except ImportError:                          # Windows
+    fcntl = None
+
+_FICLONE = 0x40049409                        # _IOW(0x94, 9, int) from <linux/fs.h>
+
+
+def _clone_copy(src, dst):
+    """Copy ``src`` to ``dst`` letting the kernel do the work.
+
+    Tries a reflink clone first (O(1) on Btrfs/XFS), then
+    ``copy_file_range`` (in-kernel, no userspace buffers) and only then a
+    plain userspace copy.
+    """
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        if fcntl is not None:
+            try:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+                return
+            except OSError:
+                pass
+
+        size = os.fstat(fsrc.fileno()).st_size
+        copied = 0
+        try:
+            while copied < size:
+                n = os.copy_file_range(fsrc.fileno(), fdst.fileno(), size - copied)
+                if n == 0:
+                    break
+                copied += n
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.ENOTSUP, errno.EOPNOTSUPP,
+                               errno.ENOSYS, errno.EINVAL):
+                raise
+        if copied == size:
+            return
+
+        fsrc.seek(0)
+        fdst.seek(0)
+        fdst.truncate()
+        shutil.copyfileobj(fsrc, fdst)
+
+
+def _clone_file(src, dst):
+    """``_clone_copy`` plus the file mode and times, like ``shutil.copy2``."""
+    _clone_copy(src, dst)
+    shutil.copystat(src, dst)
+
+
+def _mirror_tree(src_root, dst_root, copy_file):
+    """Recreate ``src_root`` under ``dst_root`` passing every regular file
+    through ``copy_file(src, dst)`` and keeping symlinks as symlinks."""
+    for root, dirs, files in os.walk(src_root, followlinks=False):
+        dst_dir = os.path.join(dst_root, os.path.relpath(root, src_root))
+        os.makedirs(dst_dir, exist_ok=True)
+        # Symlinked directories are recreated as links and not descended into
+        walk_into = []
+        for name in dirs:
+            src = os.path.join(root, name)
+            if os.path.islink(src):
+                os.symlink(os.readlink(src), os.path.join(dst_dir, name))
+            else:
+                walk_into.append(name)
+        dirs[:] = walk_into
+
+        for name in files:
+            src = os.path.join(root, name)
+            dst = os.path.join(dst_dir, name)
+            if os.path.islink(src):
+                os.symlink(os.readlink(src), dst)
+            else:
+                copy_file(src, dst)
+
+
+def _stream_extract(tarball, destination):
+    """Unpack an ``.tar.xz`` in a single sequential pass, dropping the top
+    level folder like ``strip_root=True`` does."""
+    with lzma.open(tarball) as xz, tarfile.open(fileobj=xz, mode="r|") as tf:
+        for member in tf:
+            parts = member.name.split("/", 1)
+            if len(parts) < 2 or not parts[1]:
+                continue
+            member.name = parts[1]
+            if member.islnk():
+                member.linkname = member.linkname.split("/", 1)[-1]
+            if hasattr(tarfile, "data_filter"):
+                tf.extract(member, destination, filter="data")
+            else:
+                tf.extract(member, destination)
+
+
+def _ranged_download(url, path, parts, verify=True):
+    """Fetch ``url`` into ``path`` as ``parts`` concurrent HTTP range
+    requests, each with its own connection."""
+    import requests
+
+    with requests.head(url, allow_redirects=True, timeout=30, verify=verify) as head:
+        head.raise_for_status()
+        size = int(head.headers.get("Content-Length", 0))
+        if head.headers.get("Accept-Ranges") != "bytes" or not size:
+            raise ConanException(f"{url} does not support range requests")
+        url = head.url                       # resolve the CDN redirect once
+
+    with open(path, "wb") as f:
+        f.truncate(size)
+
+    chunk = -(-size // parts)
+
+    def fetch(start):
+        end = min(start + chunk, size) - 1
+        with requests.get(url, headers={"Range": f"bytes={start}-{end}"},
+                          stream=True, timeout=60, verify=verify) as r:
+            r.raise_for_status()
+            if r.status_code != 206:
+                raise ConanException(f"{url} ignored the range request")
+            with open(path, "r+b") as f:
+                f.seek(start)
+                for block in r.iter_content(1 << 20):
+                    f.write(block)
+
+    with ThreadPoolExecutor(max_workers=parts) as pool:
+        for future in [pool.submit(fetch, start) for start in range(0, size, chunk)]:
+            future.result()
+
 
 class ArmGnuToolchain(ConanFile):
     name        = "arm-none-eabi-gcc"
@@ -11,20 +146,107 @@ class ArmGnuToolchain(ConanFile):
     settings    = "os", "arch"
     package_type = "application"                    # <<< the important change
     package_id_compatible_mode = True        # one binary works for any host
+    python_requires = "base_conan/1.0.0"
+    python_requires_extend = "base_conan.BaseRecipe"
+
+    _url    = "https://developer.arm.com/-/media/Files/downloads/gnu/13.2.rel1/binrel/arm-gnu-toolchain-13.2.rel1-x86_64-arm-none-eabi.tar.xz"
+    _sha256 = "6cd1bbc1d9ae57312bcd169ae283153a9572bd6a8e4eeae2fedfbc33b115fdbb"
 
-    def set_version(self):
-        self.version = load(
-            self, os.path.join(self.recipe_folder, "version.txt")
-        ).strip()
+    @property
+    def _extract_folder(self):
+        # Kept apart from the build folder root so the marker and any
+        # generated files don't end up in the package
+        return os.path.join(self.build_folder, "toolchain")
+
+    @property
+    def _extract_cache(self):
+        return os.path.join(self._conan_home, "toolchain_cache", self._sha256)
+
+    def _global_conf_sets(self, name):
+        # core.* confs never reach self.conf, look at global.conf instead
+        try:
+            with open(os.path.join(self._conan_home, "global.conf")) as f:
+                global_conf = f.read()
+        except OSError:
+            return False
+        return re.search(rf"^\s*{re.escape(name)}\s*=", global_conf, re.M) is not None
 
     def build(self):
-        get(self,
-            url="https://developer.arm.com/-/media/Files/downloads/gnu/13.2.rel1/binrel/arm-gnu-toolchain-13.2.rel1-x86_64-arm-none-eabi.tar.xz",
-            sha256="6cd1bbc1d9ae57312bcd169ae283153a9572bd6a8e4eeae2fedfbc33b115fdbb",
-            strip_root=True)
+        marker = os.path.join(self.build_folder, ".extracted-" + self._sha256[:16])
+        if os.path.exists(marker):
+            return
+
+        # Unpack once per user into a cache keyed by the tarball checksum,
+        # every later build only hard links the tree
+        cache = self._extract_cache
+        if not os.path.isdir(cache):
+            # A private staging folder per build, concurrent builds never
+            # unpack into the same tree
+            os.makedirs(os.path.dirname(cache), exist_ok=True)
+            partial = tempfile.mkdtemp(prefix=os.path.basename(cache) + ".partial-",
+                                       dir=os.path.dirname(cache))
+            rename_error = None
+            try:
+                self._unpack(partial)
+                try:
+                    os.rename(partial, cache)
+                except OSError as e:
+                    # Fine if another build populated the cache first, checked below
+                    rename_error = e
+            finally:
+                rmdir(self, partial)
+            if not os.path.isdir(cache):
+                raise ConanException(f"Could not populate the toolchain cache {cache}: {rename_error}")
+
+        rmdir(self, self._extract_folder)
+        _mirror_tree(cache, self._extract_folder, self._link_or_copy)
+        open(marker, "w").close()
+
+    def _unpack(self, destination):
+        # requests is only needed on a cold cache, keep it off the recipe load path
+        import requests
+
+        tarball = os.path.join(self.build_folder, "tc.tar.xz")
+        verify = self.conf.get("tools.files.download:verify", default=True, check_type=bool)
+        # download() is free on a download cache hit, and only it knows the
+        # proxies Conan is configured with
+        downloaded = False
+        if not (self._global_conf_sets("core.download:download_cache") or
+                self._global_conf_sets("core.net.http:proxies")):
+            try:
+                _ranged_download(self._url, tarball, parts=4, verify=verify)
+                check_sha256(self, tarball, self._sha256)
+                downloaded = True
+            except (requests.RequestException, ConanException, OSError) as e:
+                self.output.warning(f"Parallel download failed ({e}), retrying with a single stream")
+                if os.path.exists(tarball):
+                    os.remove(tarball)
+        if not downloaded:
+            download(self, self._url, tarball, sha256=self._sha256)
+        os.makedirs(destination, exist_ok=True)
+        if self._has_threaded_xz():
+            # Decode the LZMA blocks on all cores, tar only reads the stream
+            self.run(f'xz -T0 -dc "{tarball}" | tar xf - --strip-components=1 -C "{destination}"')
+        else:
+            _stream_extract(tarball, destination)
+        os.remove(tarball)
+
+    @staticmethod
+    def _has_threaded_xz():
+        if not (shutil.which("xz") and shutil.which("tar")):
+            return False
+        # Older xz releases accept -T but only decompress on one thread,
+        # multi-threaded decoding arrived in 5.4
+        result = subprocess.run(["xz", "--version"], capture_output=True, text=True)
+        match = re.search(r"xz \(XZ Utils\) (\d+)\.(\d+)", result.stdout)
+        return match is not None and (int(match[1]), int(match[2])) >= (5, 4)
 
     def package(self):
-        copy(self, "*", src=self.build_folder, dst=self.package_folder)
+        if hasattr(os, "copy_file_range"):
+            # Linux: reflink / in-kernel copy of the ~500 MB toolchain
+            _mirror_tree(self._extract_folder, self.package_folder, _clone_file)
+        else:
+            self._fast_copy(self._extract_folder, self.package_folder)
 
     # ------------------------------------------------------------------ #
     # Tell Conan *how* to call the compiler and where to find it.